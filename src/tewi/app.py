@@ -19,7 +19,7 @@
 __version__ = '0.6.0'
 
 from datetime import datetime
-from functools import cache, wraps
+from functools import cache, lru_cache, wraps
 from typing import NamedTuple
 import argparse
 import logging
@@ -67,7 +67,7 @@ def log_time(func):
         total_time_ms = (end_time - start_time) * 1000
 
         if total_time_ms > 1:
-            logger.info(f'Function "{func.__qualname__}": {total_time_ms:.4f} ms')
+            logger.info('Function "%s": %.4f ms', func.__qualname__, total_time_ms)
 
         return result
 
@@ -138,27 +138,54 @@ class Util:
 
     geoip = GeoIP2Fast()
 
+    size_units = ("", "k", "M", "G", "T", "P", "E", "Z", "Y")
+    speed_units = (("", 0), ("K", 0), ("M", 2), ("G", 2), ("T", 2), ("P", 2), ("E", 2), ("Z", 2), ("Y", 2))
+
+    # (singular, plural) names for each interval
+    time_intervals = (
+            (('day', 'days'), 86400),    # 60 * 60 * 24
+            (('hour', 'hours'), 3600),    # 60 * 60
+            (('minute', 'minutes'), 60),
+            (('second', 'seconds'), 1),
+            )
+
+    # preformatted values below the first size unit and below one minute
+    small_sizes = tuple(f"{n} B" for n in range(1000))
+    small_times = ('', '1 second') + tuple(f"{n} seconds" for n in range(2, 60))
+
+    ratio_format = "{:.2f}".format
+
     @cache
+    def unit_powers(base: int) -> tuple[int, ...]:
+        # base ** i for every unit plus upper bound of the last one
+        return tuple(base ** i for i in range(len(Util.size_units) + 1))
+
+    @lru_cache(maxsize=4096)
     def print_size(num: int,
                    suffix: str = "B", size_bytes: int = 1000):
 
+        if type(num) is int and 0 <= num < 1000 <= size_bytes and suffix == "B":
+            return Util.small_sizes[num]
+
         r_unit = None
         r_num = None
 
-        for unit in ("", "k", "M", "G", "T", "P", "E", "Z", "Y"):
-            if abs(num) < size_bytes:
+        powers = Util.unit_powers(size_bytes)
+
+        # pick unit by comparing with thresholds, then scale with single division
+        for i, unit in enumerate(Util.size_units):
+            if abs(num) < powers[i + 1]:
                 r_unit = unit
-                r_num = num
+                # base unit needs no scaling, keep integer as is
+                r_num = num / powers[i] if i else num
                 break
-            num /= size_bytes
-
-        round(r_num, 2)
 
-        r_size = f"{r_num:.2f}".rstrip("0").rstrip(".")
+        # 'g' format drops trailing zeros after rounding to 2 decimals
+        r_size = f"{round(r_num, 2):g}"
 
         return f"{r_size} {r_unit}{suffix}"
 
-    @cache
+    @lru_cache(maxsize=4096)
     def print_speed(num: int,
                     print_secs: bool = False,
                     suffix: str = "B",
@@ -167,39 +194,47 @@ class Util:
         r_unit = None
         r_num = None
 
-        for i in (("", 0), ("K", 0), ("M", 2), ("G", 2), ("T", 2), ("P", 2), ("E", 2), ("Z", 2), ("Y", 2)):
+        powers = Util.unit_powers(speed_bytes)
 
-            if abs(num) < speed_bytes:
-                r_unit = i[0]
-                r_num = round(num, i[1])
+        # pick unit by comparing with thresholds, then scale with single division
+        for i, (unit, precision) in enumerate(Util.speed_units):
+            if abs(num) < powers[i + 1]:
+                r_unit = unit
+                # base unit needs no scaling, keep integer as is
+                r_num = round(num / powers[i] if i else num, precision)
                 break
-            num /= speed_bytes
 
-        r_size = f"{r_num:.2f}".rstrip("0").rstrip(".")
+        # value is already rounded, 'g' format drops trailing zeros
+        r_size = f"{r_num:g}"
 
         if print_secs:
             return f"{r_size} {r_unit}{suffix}/s"
         else:
             return f"{r_size} {r_unit}{suffix}"
 
-    @cache
+    @lru_cache(maxsize=4096)
     def print_time(seconds, units: int = 1) -> str:
-        intervals = (
-                ('days', 86400),    # 60 * 60 * 24
-                ('hours', 3600),    # 60 * 60
-                ('minutes', 60),
-                ('seconds', 1),
-                )
+        if 0 <= seconds < 60:
+            return Util.small_times[int(seconds)]
+
         result = []
 
-        for name, count in intervals:
-            value = seconds // count
+        for names, count in Util.time_intervals:
+            value, seconds = divmod(seconds, count)
             if value:
-                seconds -= value * count
-                if value == 1:
-                    name = name.rstrip('s')
-                result.append(f"{value:.0f} {name}")
-        return ', '.join(result[:units])
+                result.append(f"{value:.0f} {names[value != 1]}")
+
+                # stop when enough units were printed
+                if len(result) == units:
+                    break
+        return ', '.join(result)
+
+    def print_ratio(ratio: float) -> str:
+        # skip float formatting for infinite ratio
+        if math.isinf(ratio):
+            return "∞"
+
+        return Util.ratio_format(ratio)
 
     @cache
     def get_country(address: str) -> str:
@@ -419,11 +454,9 @@ class StatisticsWidget(Static):
 
     def print_ratio(self, uploaded, downloaded) -> str:
         if downloaded == 0:
-            return "∞"
-
-        ratio = uploaded / downloaded
+            return Util.print_ratio(math.inf)
 
-        return f"{ratio:.2f}"
+        return Util.print_ratio(uploaded / downloaded)
 
 
 class AddTorrentDialog(ModalScreen):
@@ -440,6 +473,8 @@ class AddTorrentWidget(Static):
 
     r_download_dir = reactive('')
 
+    link_prefixes = ('magnet:', 'http://', 'https://')
+
     BINDINGS = [
             Binding("enter", "add", "Add torrent", priority=True),
             Binding("escape", "close", "Close"),
@@ -484,8 +519,8 @@ class AddTorrentWidget(Static):
         return None
 
     def is_link(self, text) -> bool:
-        text = text.strip()
-        return text.startswith(tuple(['magnet:', 'http://', 'https://']))
+        # only leading whitespace affects prefix check
+        return text.lstrip().startswith(self.link_prefixes)
 
     def action_add(self) -> None:
         value = self.query_one(TextArea).text
@@ -795,7 +830,7 @@ class TorrentItem(Static):
             if self.t_eta:
                 result = f"{result} ({Util.print_time(self.t_eta.total_seconds(), 2)})"
         else:
-            result = f"{size_total} (Ratio: {self.t_ratio:.2f})"
+            result = f"{size_total} (Ratio: {Util.print_ratio(self.t_ratio)})"
 
         return result
 
@@ -1302,6 +1337,9 @@ class TorrentInfoPanel(ScrollableContainer):
             Binding("G", "scroll_bottom", "Scroll to the bottom"),
             ]
 
+    # Transmission file priorities, any other value is shown as normal
+    priority_names = {-1: 'Low', 0: 'Normal', 1: 'High'}
+
     r_torrent = reactive(None)
 
     t_name = reactive(None)
@@ -1440,8 +1478,11 @@ class TorrentInfoPanel(ScrollableContainer):
             self.t_id = str(torrent.id)
             self.t_hash = torrent.hash_string
             self.t_name = torrent.name
+            # build file objects once for both counter and files table
+            files = torrent.get_files()
+
             self.t_size = Util.print_size(torrent.total_size)
-            self.t_files = str(len(torrent.get_files()))
+            self.t_files = str(len(files))
             self.t_pieces = f"{torrent.piece_count} @ {Util.print_size(torrent.piece_size, size_bytes=1024)}"
 
             if torrent.is_private:
@@ -1457,7 +1498,7 @@ class TorrentInfoPanel(ScrollableContainer):
             self.t_location = torrent.download_dir
             self.t_downloaded = Util.print_size(torrent.downloaded_ever)
             self.t_uploaded = Util.print_size(torrent.uploaded_ever)
-            self.t_ratio = f'{torrent.ratio:.2f}'
+            self.t_ratio = Util.print_ratio(torrent.ratio)
             self.t_error = torrent.error_string if torrent.error_string else "None"
 
             self.t_date_added = self.print_datetime(torrent.added_date)
@@ -1472,14 +1513,7 @@ class TorrentInfoPanel(ScrollableContainer):
             table = self.query_one("#files")
             table.clear()
 
-            for f in self.r_torrent.get_files():
-                completion = (f.completed / f.size) * 100
-                table.add_row(f.id,
-                              Util.print_size(f.size),
-                              f'{completion:.0f}%',
-                              'Yes' if f.selected else 'No',
-                              self.print_priority(f.priority),
-                              f.name)
+            table.add_rows(self.file_rows(files))
 
             table = self.query_one("#peers")
             table.clear()
@@ -1506,6 +1540,17 @@ class TorrentInfoPanel(ScrollableContainer):
                               self.print_count(t.leecher_count),
                               self.print_count(t.download_count))
 
+    def file_rows(self, files):
+        # rows are produced lazily while table consumes them
+        for f in files:
+            completion = f.completed * 100 / f.size
+            yield (f.id,
+                   Util.print_size(f.size),
+                   f'{completion:.0f}%',
+                   'Yes' if f.selected else 'No',
+                   self.print_priority(f.priority),
+                   f.name)
+
     def print_count(self, value: int) -> str:
         if value == -1:
             return "N/A"
@@ -1519,12 +1564,7 @@ class TorrentInfoPanel(ScrollableContainer):
             return "Never"
 
     def print_priority(self, priority) -> str:
-        if priority == -1:
-            return 'Low'
-        elif priority == 1:
-            return 'High'
-        else:
-            return 'Normal'
+        return self.priority_names.get(priority, 'Normal')
 
     @log_time
     def action_view_list(self):
@@ -1720,7 +1760,7 @@ class MainApp(App):
     @log_time
     @work(exclusive=True, thread=True)
     async def load_tdata(self) -> None:
-        logging.info("Start loading data from Transmission...")
+        logger.info("Start loading data from Transmission...")
 
         session = self.client.get_session()
         session_stats = self.client.session_stats()
@@ -1729,13 +1769,28 @@ class MainApp(App):
         if self.limit_torrents:
             torrents = torrents[:self.limit_torrents]
 
-        torrents_down = len([x for x in torrents if x.status == 'downloading'])
-        torrents_seed = len([x for x in torrents if x.status == 'seeding'])
-        torrents_check = len([x for x in torrents if x.status == 'checking'])
-        torrents_stop = len(torrents) - torrents_down - torrents_seed - torrents_check
+        torrents_down = 0
+        torrents_seed = 0
+        torrents_check = 0
+
+        torrents_complete_size = 0
+        torrents_total_size = 0
 
-        torrents_complete_size = sum(t.size_when_done - t.left_until_done for t in torrents)
-        torrents_total_size = sum(t.size_when_done for t in torrents)
+        # collect all statistics in single pass over torrents
+        for t in torrents:
+            match t.status:
+                case 'downloading':
+                    torrents_down += 1
+                case 'seeding':
+                    torrents_seed += 1
+                case 'checking':
+                    torrents_check += 1
+
+            size_when_done = t.size_when_done
+            torrents_complete_size += size_when_done - t.left_until_done
+            torrents_total_size += size_when_done
+
+        torrents_stop = len(torrents) - torrents_down - torrents_seed - torrents_check
 
         tsession = TransmissionSession(
                 session=session,
@@ -1756,7 +1811,7 @@ class MainApp(App):
         self.log(vars(session))
         self.log(vars(session_stats))
 
-        logging.info(f"Loaded from Transmission {session.version}: {len(torrents)} torrents")
+        logger.info("Loaded from Transmission %s: %d torrents", session.version, len(torrents))
 
         self.call_from_thread(self.set_tdata, torrents, tsession)
 
@@ -1921,8 +1976,8 @@ def cli():
                 level=logging.DEBUG,
                 datefmt='%Y-%m-%d %H:%M:%S')
 
-    logger.info(f'Start Tewi {tewi_version}...')
-    logger.info(f'Loaded CLI options: {args}')
+    logger.info('Start Tewi %s...', tewi_version)
+    logger.info('Loaded CLI options: %s', args)
 
     app = MainApp(host=args.host, port=args.port,
                   username=args.username, password=args.password,